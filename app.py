@@ -3,17 +3,30 @@ Streamlit UI for TwineWriter - AI Twitter Content Agent
 """
 
 import streamlit as st
+import base64
 import os
-import time
+from copy import copy
 from datetime import datetime
-import json
+import orjson
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
 # Import the core functionality from package modules
+from langgraph.graph import StateGraph, END
+
+from twinewriter.llm import env_provider, get_llm
 from twinewriter.models import AgentState, TweetItem
+from twinewriter.nodes import (
+    build_generation_messages,
+    input_node,
+    content_generation_node,
+    length_checker_node,
+    thread_splitter_node,
+    finalizer_node,
+)
+from twinewriter.workflow import iter_graph_stream
 
 # Page config
 st.set_page_config(
@@ -24,8 +37,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown(
-    """
+_CSS = """
 <style>
     .main-header {
         font-size: 3rem;
@@ -82,68 +94,132 @@ st.markdown(
         width: 100%;
     }
 </style>
-""",
-    unsafe_allow_html=True,
-)
+"""
+# Streamlit drops any element a rerun does not re-emit, so the stylesheet is sent
+# on every run; the frontend reconciles the unchanged element cheaply.
+st.markdown(_CSS, unsafe_allow_html=True)
 
 # Initialize session state
-if "generated_tweets" not in st.session_state:
-    st.session_state.generated_tweets = []
-if "final_json" not in st.session_state:
-    st.session_state.final_json = None
-if "generation_count" not in st.session_state:
-    st.session_state.generation_count = 0
-if "edit_mode" not in st.session_state:
-    st.session_state.edit_mode = False
-if "is_generating" not in st.session_state:
-    st.session_state.is_generating = False
-if "show_examples" not in st.session_state:
-    st.session_state.show_examples = False
-if "topic" not in st.session_state:
-    st.session_state.topic = ""
-# LLM Configuration in session state
-if "llm_provider" not in st.session_state:
-    st.session_state.llm_provider = None
-if "previous_llm_provider" not in st.session_state:
-    st.session_state.previous_llm_provider = None
-if "openai_api_key" not in st.session_state:
-    st.session_state.openai_api_key = ""
-if "anthropic_api_key" not in st.session_state:
-    st.session_state.anthropic_api_key = ""
-if "ollama_model" not in st.session_state:
-    st.session_state.ollama_model = "llama3.2"
-if "ollama_base_url" not in st.session_state:
-    st.session_state.ollama_base_url = "http://localhost:11434"
-if "config_source" not in st.session_state:
-    st.session_state.config_source = "Configure via UI"
-if "trigger_regenerate" not in st.session_state:
-    st.session_state.trigger_regenerate = False
+_DEFAULTS = {
+    "generated_tweets": [],
+    "final_json": None,
+    "generation_count": 0,
+    "edit_mode": False,
+    "is_generating": False,
+    "show_examples": False,
+    "topic": "",
+    # LLM Configuration in session state
+    "llm_provider": None,
+    "previous_llm_provider": None,
+    "openai_api_key": "",
+    "anthropic_api_key": "",
+    "ollama_model": "llama3.2",
+    "ollama_base_url": "http://localhost:11434",
+    "config_source": "Configure via UI",
+    "trigger_regenerate": False,
+}
+for key, value in _DEFAULTS.items():
+    # copy() so sessions never share a mutable default (e.g. generated_tweets)
+    st.session_state.setdefault(key, copy(value))
+
+# Single-pass HTML escaping for tweet text rendered with unsafe_allow_html
+_HTML_ESCAPE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"}
+)
 
-# Header bar (beautiful)
-import base64
-import webbrowser
+# Status line shown while each workflow node runs
+_STATUS = {
+    "input": "📥 Processing input...",
+    "generate": "✍️ Generating content...",
+    "check_length": "📏 Checking content length...",
+    "split_thread": "✂️ Splitting into thread...",
+    "finalize": "✨ Finalizing...",
+}
+
+# Fields exported for each tweet in the JSON thread payload
+_THREAD_FIELDS = TweetItem._fields
 
 # Example topics for inspiration
-example_topics = [
+EXAMPLE_TOPICS: tuple[str, ...] = (
     "5 tips for effective time management in remote work",
     "The future of AI in healthcare: opportunities and challenges",
     "How to build a morning routine that sets you up for success",
     "Understanding blockchain technology: a beginner's guide",
     "Sustainable living: small changes with big environmental impact",
-]
+)
+
+
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60)
+def _logo_data_uri(path: str) -> str:
+    """Read and base64-encode the logo once; reruns reuse the cached string."""
+    with open(path, "rb") as f:
+        encoded = base64.b64encode(f.read()).decode()
+    return f"data:image/png;base64,{encoded}"
+
+
+def _resolve_provider() -> str | None:
+    """Return the active LLM provider: UI configuration first, then environment.
+
+    Mirrors twinewriter.llm.get_llm: once the UI has set a provider only the
+    UI configuration counts, otherwise it falls back to OPENAI_API_KEY /
+    ANTHROPIC_API_KEY / USE_OLLAMA.
+    """
+    if not st.session_state.llm_provider:
+        return env_provider()
+
+    if st.session_state.openai_api_key:
+        return "openai"
+    if st.session_state.anthropic_api_key:
+        return "anthropic"
+    if st.session_state.llm_provider == "Ollama" and st.session_state.ollama_model:
+        return "ollama"
+    return None
+
+
+@st.cache_resource(show_spinner=False)
+def get_graph():
+    """Build and compile the automated generation workflow once per process.
+
+    The topology is static, so the compiled graph is shared across reruns and
+    sessions. It is compiled without a checkpointer: a process-wide saver would
+    keep every session's state (API keys included) for the life of the server.
+    """
+    workflow = StateGraph(AgentState)
+
+    # Add nodes (excluding human review for automated flow)
+    workflow.add_node("input", input_node)
+    workflow.add_node("generate", content_generation_node)
+    workflow.add_node("check_length", length_checker_node)
+    workflow.add_node("split_thread", thread_splitter_node)
+    workflow.add_node("finalize", finalizer_node)
+
+    # Define edges
+    workflow.set_entry_point("input")
+    workflow.add_edge("input", "generate")
+    workflow.add_edge("generate", "check_length")
+
+    # Conditional edge for thread splitting
+    def should_split(state):
+        return "split_thread" if not state["tweets"] else "finalize"
+
+    workflow.add_conditional_edges("check_length", should_split)
+    workflow.add_edge("split_thread", "finalize")
+    workflow.add_edge("finalize", END)
+
+    return workflow.compile()
+
 
 # Build logo data URI if a logo file exists in public/images/logo.png; fallback to emoji badge
 logo_img_html = '<div class="logo-badge">🐦</div>'
 try:
     logo_path = os.path.join(os.path.dirname(__file__), "public", "images", "logo.png")
     if os.path.exists(logo_path):
-        with open(logo_path, "rb") as f:
-            encoded = base64.b64encode(f.read()).decode()
-        logo_img_html = f'<img src="data:image/png;base64,{encoded}" style="width:48px;height:48px;border-radius:10px;object-fit:cover;" />'
+        logo_img_html = f'<img src="{_logo_data_uri(logo_path)}" style="width:48px;height:48px;border-radius:10px;object-fit:cover;" />'
 except Exception:
     # leave fallback badge
     pass
 
+# Header bar (beautiful)
 header_html = f"""
 <div class="header-bar">
     <div class="header-left">
@@ -162,6 +238,189 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def _thread_json(thread_rows: tuple, topic: str, tone: str, timestamp: str) -> bytes:
+    """Serialize the downloadable thread once per distinct (tweets, topic, tone).
+
+    The timestamp is passed in rather than taken here, so a cached entry never
+    hands one session's export time to another.
+    """
+    return orjson.dumps(
+        {
+            "timestamp": timestamp,
+            "topic": topic,
+            "tone": tone,
+            "thread": [dict(zip(_THREAD_FIELDS, row)) for row in thread_rows],
+        },
+        option=orjson.OPT_INDENT_2,
+    )
+
+
+def _download_stamp(prefix: str) -> datetime:
+    """Return when the current tweets were first offered for download under `prefix`.
+
+    Only one (signature, timestamp) pair is kept per prefix, and it is replaced
+    once the tweets change.
+    """
+    sig = hash(tuple((t.index, t.content) for t in st.session_state.generated_tweets))
+    key = f"dl_stamp_{prefix}"
+    saved = st.session_state.get(key)
+    if saved is None or saved[0] != sig:
+        saved = st.session_state[key] = (sig, datetime.now())
+    return saved[1]
+
+
+def _download_name(prefix: str) -> str:
+    """Return a timestamped file name that stays stable while the tweets are unchanged."""
+    return f"{prefix}_{_download_stamp(prefix):%Y%m%d_%H%M%S}.json"
+
+
+# Define callback for topic suggestion clicks
+def set_topic(suggestion):
+    st.session_state.topic_input = suggestion
+
+
+@st.fragment
+def _results_panel(topic, tone):
+    """Render, edit and export the generated tweets.
+
+    Runs as a fragment so edit-mode toggles, tweet updates and approval only
+    rerun this panel instead of the whole script.
+    """
+    if st.session_state.generated_tweets:
+        # Edit mode toggle
+        edit_col1, edit_col2 = st.columns([1, 4])
+        with edit_col1:
+            if st.button(
+                "✏️ Edit Mode" if not st.session_state.edit_mode else "👁️ View Mode"
+            ):
+                st.session_state.edit_mode = not st.session_state.edit_mode
+
+        st.divider()
+
+        # Display tweets (hot names bound to locals for the loop)
+        tweets = st.session_state.generated_tweets
+        edit_mode = st.session_state.edit_mode
+        md = st.markdown
+        total = len(tweets)
+        for idx, tweet in enumerate(tweets):
+            char_color = "red" if tweet.char_count > 280 else "green"
+
+            if not edit_mode:
+                # Display mode: one markdown message per tweet
+                md(
+                    f'<div class="tweet-box">'
+                    f'<div style="display:flex;justify-content:space-between;">'
+                    f'<span class="tweet-number">Tweet {tweet.index}/{total}</span>'
+                    f'<div class="char-count" style="color: {char_color};">{tweet.char_count}/280</div>'
+                    f"</div>"
+                    f"<p>{tweet.content.translate(_HTML_ESCAPE)}</p>"
+                    f"</div>",
+                    unsafe_allow_html=True,
+                )
+                continue
+
+            with st.container():
+                md(f'<div class="tweet-box">', unsafe_allow_html=True)
+
+                col_a, col_b = st.columns([4, 1])
+
+                with col_a:
+                    md(
+                        f'<span class="tweet-number">Tweet {tweet.index}/{total}</span>',
+                        unsafe_allow_html=True,
+                    )
+
+                with col_b:
+                    md(
+                        f'<div class="char-count" style="color: {char_color};">{tweet.char_count}/280</div>',
+                        unsafe_allow_html=True,
+                    )
+
+                # Editable text area
+                edited_content = st.text_area(
+                    f"Edit Tweet {tweet.index}",
+                    value=tweet.content,
+                    key=f"edit_{idx}",
+                    height=100,
+                    label_visibility="collapsed",
+                )
+
+                # Update button
+                if st.button(f"Update Tweet {tweet.index}", key=f"update_{idx}"):
+                    tweets[idx] = TweetItem(
+                        index=tweet.index,
+                        content=edited_content,
+                        char_count=len(edited_content),
+                    )
+                    st.rerun(scope="fragment")
+
+                md("</div>", unsafe_allow_html=True)
+
+        st.divider()
+
+        # TweetItems are (index, content, char_count) tuples, shared by the
+        # approve and download actions as-is
+        thread_rows = tuple(tweets)
+
+        # Action buttons
+        action_col1, action_col2, action_col3 = st.columns(3)
+
+        with action_col1:
+            if st.button("🔄 Regenerate", type="secondary"):
+                st.session_state.generated_tweets = []
+                st.session_state.final_json = None
+                st.session_state.trigger_regenerate = True
+                st.rerun()
+
+        with action_col2:
+            if st.button("✅ Approve & Finalize", type="primary"):
+                # Create final JSON
+                st.session_state.final_json = {
+                    "status": "approved",
+                    "timestamp": datetime.now().isoformat(),
+                    "topic": topic,
+                    "tone": tone,
+                    "thread": [dict(zip(_THREAD_FIELDS, row)) for row in thread_rows],
+                    "total_tweets": len(st.session_state.generated_tweets),
+                    "is_thread": len(st.session_state.generated_tweets) > 1,
+                }
+                st.session_state.final_json_text = orjson.dumps(
+                    st.session_state.final_json, option=orjson.OPT_INDENT_2
+                )
+                st.success("✅ Content approved and finalized!")
+                st.balloons()
+
+        with action_col3:
+            # Download as JSON
+            if st.session_state.generated_tweets:
+                st.download_button(
+                    label="💾 Download JSON",
+                    data=_thread_json(
+                        thread_rows,
+                        topic,
+                        tone,
+                        _download_stamp("twinewriter").isoformat(),
+                    ),
+                    file_name=_download_name("twinewriter"),
+                    mime="application/json",
+                )
+
+        # Display final JSON if available
+        if st.session_state.final_json:
+            st.header("📄 Final Output")
+            st.json(st.session_state.final_json)
+
+            st.download_button(
+                label="💾 Download Final JSON",
+                data=st.session_state.final_json_text,
+                file_name=_download_name("twinewriter_final"),
+                mime="application/json",
+                type="primary",
+            )
+
+
 # Main layout: left = inputs + info, right = results
 col1, col2 = st.columns([1, 2])
 
@@ -182,6 +441,44 @@ with col1:
             st.info(f"🔄 Session cleared due to LLM provider change from {st.session_state.previous_llm_provider} to {new_provider}")
         st.session_state.previous_llm_provider = new_provider
 
+    # Widget callbacks: apply provider config only when an input actually changes,
+    # instead of re-applying it on every rerun
+    def _apply_openai_key():
+        openai_key = st.session_state.openai_key_input
+        if openai_key:
+            clear_session_on_llm_change("OpenAI")
+            st.session_state.llm_provider = "OpenAI"
+            st.session_state.anthropic_api_key = ""
+        elif st.session_state.llm_provider == "OpenAI":
+            # Clearing the key hands provider selection back to the environment
+            st.session_state.llm_provider = None
+        st.session_state.openai_api_key = openai_key
+        st.session_state.pop("resolved_llm_provider", None)
+
+    def _apply_anthropic_key():
+        anthropic_key = st.session_state.anthropic_key_input
+        if anthropic_key:
+            clear_session_on_llm_change("Anthropic")
+            st.session_state.llm_provider = "Anthropic"
+            st.session_state.openai_api_key = ""
+        elif st.session_state.llm_provider == "Anthropic":
+            st.session_state.llm_provider = None
+        st.session_state.anthropic_api_key = anthropic_key
+        st.session_state.pop("resolved_llm_provider", None)
+
+    def _apply_ollama_config():
+        ollama_model = st.session_state.ollama_model_input
+        if ollama_model:
+            clear_session_on_llm_change("Ollama")
+            st.session_state.llm_provider = "Ollama"
+            st.session_state.ollama_model = ollama_model
+            st.session_state.ollama_base_url = st.session_state.ollama_url_input
+            st.session_state.openai_api_key = ""
+            st.session_state.anthropic_api_key = ""
+        elif st.session_state.llm_provider == "Ollama":
+            st.session_state.llm_provider = None
+        st.session_state.pop("resolved_llm_provider", None)
+
     # LLM Configuration Section
     with st.expander("🤖 LLM Configuration", expanded=False):
         llm_provider = st.selectbox(
@@ -192,77 +489,65 @@ with col1:
         )
         
         if llm_provider == "OpenAI":
-            openai_key = st.text_input(
+            st.text_input(
                 "OpenAI API Key",
                 type="password",
                 help="Enter your OpenAI API key",
                 placeholder="sk-...",
-                key="openai_key_input"
+                key="openai_key_input",
+                on_change=_apply_openai_key,
             )
-            if openai_key:
-                clear_session_on_llm_change("OpenAI")
-                st.session_state.llm_provider = "OpenAI"
-                st.session_state.openai_api_key = openai_key
-                st.session_state.anthropic_api_key = ""
+            if st.session_state.llm_provider == "OpenAI" and st.session_state.openai_api_key:
                 st.success("✅ OpenAI configured")
             else:
                 st.info("👆 Enter your OpenAI API key above")
             
         elif llm_provider == "Anthropic":
-            anthropic_key = st.text_input(
+            st.text_input(
                 "Anthropic API Key",
                 type="password",
                 help="Enter your Anthropic API key",
                 placeholder="sk-ant-...",
-                key="anthropic_key_input"
+                key="anthropic_key_input",
+                on_change=_apply_anthropic_key,
             )
-            if anthropic_key:
-                clear_session_on_llm_change("Anthropic")
-                st.session_state.llm_provider = "Anthropic"
-                st.session_state.anthropic_api_key = anthropic_key
-                st.session_state.openai_api_key = ""
+            if st.session_state.llm_provider == "Anthropic" and st.session_state.anthropic_api_key:
                 st.success("✅ Anthropic configured")
             else:
                 st.info("👆 Enter your Anthropic API key above")
                 
         elif llm_provider == "Ollama":
-            ollama_model = st.text_input(
+            st.text_input(
                 "Ollama Model",
                 value=st.session_state.ollama_model,
                 help="Enter the Ollama model name (e.g., llama3.2, mistral)",
                 placeholder="llama3.2",
-                key="ollama_model_input"
+                key="ollama_model_input",
+                on_change=_apply_ollama_config,
             )
-            ollama_base_url = st.text_input(
+            st.text_input(
                 "Ollama Base URL",
                 value=st.session_state.ollama_base_url,
                 help="Ollama server URL",
                 placeholder="http://localhost:11434",
-                key="ollama_url_input"
+                key="ollama_url_input",
+                on_change=_apply_ollama_config,
             )
-            if ollama_model:
-                clear_session_on_llm_change("Ollama")
-                st.session_state.llm_provider = "Ollama"
-                st.session_state.ollama_model = ollama_model
-                st.session_state.ollama_base_url = ollama_base_url
-                st.session_state.openai_api_key = ""
-                st.session_state.anthropic_api_key = ""
-                st.success(f"✅ Ollama configured with model: {ollama_model}")
-
-    # Check LLM configuration status
-    has_openai = st.session_state.openai_api_key != ""
-    has_anthropic = st.session_state.anthropic_api_key != ""
-    use_ollama = st.session_state.llm_provider == "Ollama" and st.session_state.ollama_model != ""
-
-    if not (has_openai or has_anthropic or use_ollama):
+            # Selecting Ollama with the default model configures it right away
+            if st.session_state.llm_provider != "Ollama" and st.session_state.ollama_model_input:
+                _apply_ollama_config()
+            if st.session_state.llm_provider == "Ollama":
+                st.success(f"✅ Ollama configured with model: {st.session_state.ollama_model}")
+
+    # Check LLM configuration status (re-resolved only after a config callback fires)
+    if "resolved_llm_provider" not in st.session_state:
+        st.session_state.resolved_llm_provider = _resolve_provider()
+
+    if not st.session_state.resolved_llm_provider:
         st.error("❌ Please configure an LLM provider above to generate content")
 
     st.divider()
 
-    # Define callback for topic suggestion clicks
-    def set_topic(suggestion):
-        st.session_state.topic_input = suggestion
-
     # Input form
     topic = st.text_area(
         "Topic",
@@ -275,7 +560,7 @@ with col1:
     # Topic suggestions in a collapsible section
     with st.expander("💡 Need inspiration? Try these topics", expanded=False):
         suggestion_cols = st.columns(2)
-        for i, topic_suggestion in enumerate(example_topics):
+        for i, topic_suggestion in enumerate(EXAMPLE_TOPICS):
             with suggestion_cols[i % 2]:
                 if st.button(
                     f"• {topic_suggestion}",
@@ -433,109 +718,32 @@ with col2:
                 "anthropic_api_key": st.session_state.anthropic_api_key,
                 "ollama_model": st.session_state.ollama_model,
                 "ollama_base_url": st.session_state.ollama_base_url,
-                # Generated content
-                "raw_content": "",
-                "tweets": [],
-                "human_feedback": "",
-                "needs_revision": False,
-                "approved": False,
-                "final_json": {},
-                "error": "",
-                # Enable streaming flag
-                "enable_streaming": True,
+                # Remaining AgentState fields are filled in by the nodes
             }
 
             # Verify LLM is configured
-            has_config = (
-                st.session_state.openai_api_key != ""
-                or st.session_state.anthropic_api_key != ""
-                or (st.session_state.llm_provider == "Ollama" and st.session_state.ollama_model != "")
-            )
-            
-            if not has_config:
+            if not st.session_state.resolved_llm_provider:
                 st.error("⚠️ No LLM configured! Please configure an LLM provider above.")
                 st.session_state.is_generating = False
                 progress_bar.empty()
                 status_text.empty()
                 st.stop()
 
-            # Create graph without human review node for Streamlit
-            status_text.text("🎯 Creating generation pipeline...")
-            progress_bar.progress(40)
-
-            from langgraph.graph import StateGraph, END
-            from twinewriter.nodes import (
-                input_node,
-                content_generation_node,
-                length_checker_node,
-                thread_splitter_node,
-                finalizer_node,
-            )
-
-            workflow = StateGraph(AgentState)
-
-            # Add nodes (excluding human review for automated flow)
-            status_text.text("⚡ Setting up AI processing nodes...")
+            # Fetch the cached generation pipeline (no human review node for Streamlit)
+            status_text.text("🎯 Preparing generation pipeline...")
             progress_bar.progress(50)
 
-            workflow.add_node("input", input_node)
-            workflow.add_node("generate", content_generation_node)
-            workflow.add_node("check_length", length_checker_node)
-            workflow.add_node("split_thread", thread_splitter_node)
-            workflow.add_node("finalize", finalizer_node)
-
-            # Define edges
-            workflow.set_entry_point("input")
-            workflow.add_edge("input", "generate")
-            workflow.add_edge("generate", "check_length")
-
-            # Conditional edge for thread splitting
-            def should_split(state):
-                return "split_thread" if not state["tweets"] else "finalize"
+            graph = get_graph()
 
-            workflow.add_conditional_edges("check_length", should_split)
-            workflow.add_edge("split_thread", "finalize")
-            workflow.add_edge("finalize", END)
-
-            # Compile and run
-            status_text.text("🔨 Compiling workflow...")
-            progress_bar.progress(70)
-
-            from langgraph.checkpoint.memory import MemorySaver
-            
             # Generate content with streaming BEFORE workflow
             status_text.text("🤖 Generating content with AI...")
             progress_bar.progress(75)
             
-            # Import LLM and generate with streaming
-            from twinewriter.llm import get_llm
-            from langchain_core.messages import SystemMessage, HumanMessage
-            
+            # Generate with streaming
             try:
                 llm = get_llm(initial_state)
                 
-                system_prompt = f"""You are TwineWriter, an expert Twitter content creator.
-
-Your task: Create engaging Twitter content based on the user's topic and desired tone.
-
-GUIDELINES:
-- Tone: {tone}
-- Write naturally and conversationally
-- Use hooks that grab attention
-- Include relevant emojis when appropriate
-- Make it shareable and engaging
-- If the content is complex, write it as a cohesive piece (we'll split it later if needed)
-
-Topic: {topic}
-
-{f"Base content to expand on: {base_content}" if base_content else ""}
-
-Generate the tweet content now. Write it as a single cohesive piece - don't worry about length."""
-
-                messages = [
-                    SystemMessage(content=system_prompt),
-                    HumanMessage(content=f"Create engaging Twitter content about: {topic}"),
-                ]
+                messages = build_generation_messages(topic, tone, base_content)
                 
                 # Stream the content generation
                 full_content = ""
@@ -551,7 +759,6 @@ Generate the tweet content now. Write it as a single cohesive piece - don't worr
                 
                 # Update initial state with generated content
                 initial_state["raw_content"] = full_content.strip()
-                initial_state["enable_streaming"] = False  # Disable streaming in workflow
                 
                 progress_bar.progress(85)
                 
@@ -565,51 +772,45 @@ Generate the tweet content now. Write it as a single cohesive piece - don't worr
             # Now run the workflow for processing
             status_text.text("📏 Processing and splitting content...")
             
-            graph = workflow.compile(checkpointer=MemorySaver())
-
-            config = {
-                "configurable": {"thread_id": f"streamlit-{datetime.now().timestamp()}"}
-            }
-            
             final_state = None
             current_node = ""
+            preview = None
+            tweet_slots: list = []
             
             # Stream the graph execution with live updates
-            for state in graph.stream(initial_state, config):
+            for state in iter_graph_stream(graph, initial_state):
                 final_state = state
-                node_name = list(state.keys())[0]
+                node_name = next(iter(state))
                 node_state = state[node_name]
                 
                 # Update status based on current node
                 if node_name != current_node:
                     current_node = node_name
-                    if node_name == "input":
-                        status_text.text("📥 Processing input...")
-                    elif node_name == "generate":
-                        status_text.text("✍️ Generating content...")
+                    if node_name in _STATUS:
+                        status_text.text(_STATUS[node_name])
+                    if node_name == "generate":
                         # Clear the streaming placeholder after generation starts
                         stream_placeholder.empty()
-                    elif node_name == "check_length":
-                        status_text.text("📏 Checking content length...")
-                    elif node_name == "split_thread":
-                        status_text.text("✂️ Splitting into thread...")
-                    elif node_name == "finalize":
-                        status_text.text("✨ Finalizing...")
                 
-                # Display final tweets after generation
+                # Display final tweets after generation, rendering only newly seen ones
                 if node_state.get("tweets") and node_name in ["check_length", "split_thread", "finalize"]:
-                    with stream_placeholder.container():
-                        st.markdown("### � Generated Tweets Preview")
-                        for tweet in node_state["tweets"]:
-                            st.markdown(f"**Tweet {tweet.index}/{len(node_state['tweets'])}:** {tweet.content}")
+                    if preview is None:
+                        preview = stream_placeholder.container()
+                        preview.markdown("### � Generated Tweets Preview")
+                    total = len(node_state["tweets"])
+                    for tweet in node_state["tweets"][len(tweet_slots):]:
+                        slot = preview.empty()
+                        with slot.container():
+                            st.markdown(f"**Tweet {tweet.index}/{total}:** {tweet.content}")
                             st.caption(f"Characters: {tweet.char_count}/{max_tweet_length}")
+                        tweet_slots.append(slot)
 
             status_text.text("✨ Finalizing output...")
             progress_bar.progress(90)
 
             # Extract final state
             if final_state:
-                last_node = list(final_state.keys())[-1]
+                last_node = next(reversed(final_state))
                 final_state = final_state[last_node]
 
             if (
@@ -650,137 +851,12 @@ Generate the tweet content now. Write it as a single cohesive piece - don't worr
         finally:
             # clear the generating flag so button becomes active again
             st.session_state.is_generating = False
-            # Clear progress indicators after a short delay
-            time.sleep(1)
+            # Clear progress indicators right away; the success/error message stays
             progress_bar.empty()
             status_text.empty()
 
-    # Display generated tweets
-    if st.session_state.generated_tweets:
-        # Edit mode toggle
-        edit_col1, edit_col2 = st.columns([1, 4])
-        with edit_col1:
-            if st.button(
-                "✏️ Edit Mode" if not st.session_state.edit_mode else "👁️ View Mode"
-            ):
-                st.session_state.edit_mode = not st.session_state.edit_mode
-
-        st.divider()
-
-        # Display tweets
-        for idx, tweet in enumerate(st.session_state.generated_tweets):
-            with st.container():
-                st.markdown(f'<div class="tweet-box">', unsafe_allow_html=True)
-
-                col_a, col_b = st.columns([4, 1])
-
-                with col_a:
-                    st.markdown(
-                        f'<span class="tweet-number">Tweet {tweet.index}/{len(st.session_state.generated_tweets)}</span>',
-                        unsafe_allow_html=True,
-                    )
-
-                with col_b:
-                    char_color = "red" if tweet.char_count > 280 else "green"
-                    st.markdown(
-                        f'<div class="char-count" style="color: {char_color};">{tweet.char_count}/280</div>',
-                        unsafe_allow_html=True,
-                    )
-
-                if st.session_state.edit_mode:
-                    # Editable text area
-                    edited_content = st.text_area(
-                        f"Edit Tweet {tweet.index}",
-                        value=tweet.content,
-                        key=f"edit_{idx}",
-                        height=100,
-                        label_visibility="collapsed",
-                    )
-
-                    # Update button
-                    if st.button(f"Update Tweet {tweet.index}", key=f"update_{idx}"):
-                        st.session_state.generated_tweets[idx] = TweetItem(
-                            index=tweet.index,
-                            content=edited_content,
-                            char_count=len(edited_content),
-                        )
-                        st.rerun()
-                else:
-                    # Display mode
-                    st.markdown(f"<p>{tweet.content}</p>", unsafe_allow_html=True)
-
-                st.markdown("</div>", unsafe_allow_html=True)
-
-        st.divider()
-
-        # Action buttons
-        action_col1, action_col2, action_col3 = st.columns(3)
-
-        with action_col1:
-            if st.button("🔄 Regenerate", type="secondary"):
-                st.session_state.generated_tweets = []
-                st.session_state.final_json = None
-                st.session_state.trigger_regenerate = True
-                st.rerun()
-
-        with action_col2:
-            if st.button("✅ Approve & Finalize", type="primary"):
-                # Create final JSON
-                st.session_state.final_json = {
-                    "status": "approved",
-                    "timestamp": datetime.now().isoformat(),
-                    "topic": topic if "topic" in locals() else "N/A",
-                    "tone": tone if "tone" in locals() else "N/A",
-                    "thread": [
-                        {
-                            "index": tweet.index,
-                            "content": tweet.content,
-                            "char_count": tweet.char_count,
-                        }
-                        for tweet in st.session_state.generated_tweets
-                    ],
-                    "total_tweets": len(st.session_state.generated_tweets),
-                    "is_thread": len(st.session_state.generated_tweets) > 1,
-                }
-                st.success("✅ Content approved and finalized!")
-                st.balloons()
-
-        with action_col3:
-            # Download as JSON
-            if st.session_state.generated_tweets:
-                json_data = {
-                    "timestamp": datetime.now().isoformat(),
-                    "topic": topic if "topic" in locals() else "N/A",
-                    "tone": tone if "tone" in locals() else "N/A",
-                    "thread": [
-                        {
-                            "index": t.index,
-                            "content": t.content,
-                            "char_count": t.char_count,
-                        }
-                        for t in st.session_state.generated_tweets
-                    ],
-                }
-
-                st.download_button(
-                    label="💾 Download JSON",
-                    data=json.dumps(json_data, indent=2),
-                    file_name=f"twinewriter_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                    mime="application/json",
-                )
-
-        # Display final JSON if available
-        if st.session_state.final_json:
-            st.header("📄 Final Output")
-            st.json(st.session_state.final_json)
-
-            st.download_button(
-                label="💾 Download Final JSON",
-                data=json.dumps(st.session_state.final_json, indent=2),
-                file_name=f"twinewriter_final_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                mime="application/json",
-                type="primary",
-            )
+    # Display generated tweets (rerun in isolation on edits/approval)
+    _results_panel(topic, tone)
 
 # Footer
 st.divider()
@@ -0,0 +1,82 @@
+import pytest
+
+from twinewriter import llm as llm_module
+
+
+@pytest.fixture
+def llm_env(monkeypatch):
+    """Clear the LLM env vars, and re-snapshot the real environment afterwards."""
+    for key in llm_module._ENV_KEYS:
+        monkeypatch.delenv(key, raising=False)
+    # Record which provider class gets built instead of importing the adapters
+    monkeypatch.setattr(
+        llm_module, "_chat_model_class", lambda provider: lambda **kwargs: provider
+    )
+    yield monkeypatch
+    monkeypatch.undo()
+    llm_module.refresh_env()
+
+
+@pytest.mark.parametrize(
+    "env, expected",
+    [
+        ({}, None),
+        ({"USE_OLLAMA": "true"}, "ollama"),
+        ({"USE_OLLAMA": "no"}, None),
+        ({"ANTHROPIC_API_KEY": "sk-ant", "USE_OLLAMA": "1"}, "anthropic"),
+        ({"OPENAI_API_KEY": "sk-oai", "ANTHROPIC_API_KEY": "sk-ant"}, "openai"),
+        ({"OPENAI_API_KEY": "false", "ANTHROPIC_API_KEY": "sk-ant"}, "anthropic"),
+        ({"OPENAI_API_KEY": "False", "ANTHROPIC_API_KEY": "false"}, None),
+        ({"OPENAI_API_KEY": "", "USE_OLLAMA": "yes"}, "ollama"),
+    ],
+)
+def test_get_llm_env_precedence(llm_env, env, expected):
+    for key, value in env.items():
+        llm_env.setenv(key, value)
+    llm_module.refresh_env()
+
+    assert llm_module.env_provider() == expected
+    if expected is None:
+        with pytest.raises(RuntimeError, match="No LLM configured"):
+            llm_module.get_llm()
+    else:
+        assert llm_module.get_llm()._llm == expected
+
+
+def test_refresh_env_drops_cached_env_client(llm_env):
+    llm_env.setenv("ANTHROPIC_API_KEY", "sk-ant")
+    llm_module.refresh_env()
+    assert llm_module.get_llm()._llm == "anthropic"
+
+    # Without a refresh the snapshot (and the cached client) still win
+    llm_env.setenv("OPENAI_API_KEY", "sk-oai")
+    assert llm_module.get_llm()._llm == "anthropic"
+
+    llm_module.refresh_env()
+    assert llm_module.get_llm()._llm == "openai"
+
+
+def test_stream_hits_response_cache(monkeypatch):
+    pytest.importorskip("langchain_core")
+    from langchain_core.caches import InMemoryCache
+    from langchain_core.globals import get_llm_cache, set_llm_cache
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+    from langchain_core.messages import HumanMessage
+
+    previous_cache = get_llm_cache()
+    set_llm_cache(InMemoryCache())
+    monkeypatch.setattr(llm_module, "_RESPONSE_CACHE_ENABLED", True)
+    try:
+        model = FakeListChatModel(responses=["first draft", "second draft"])
+        llm = llm_module.LLMWrapper(model)
+        messages = [HumanMessage(content="Write a tweet about caching")]
+
+        first = "".join(llm.stream(messages))
+        second = "".join(llm.stream(messages))
+    finally:
+        set_llm_cache(previous_cache)
+
+    # The second call is answered from the cache, so the fake model never
+    # advances to its next canned response
+    assert first == second == "first draft"
+    assert model.i == 1
@@ -1,5 +1,8 @@
 """Command-line interface for TwineWriter."""
 
+import logging
+import os
+
 from dotenv import load_dotenv
 
 from .workflow import run_twinewriter
@@ -8,6 +11,13 @@ from .workflow import run_twinewriter
 def main():
     load_dotenv()
 
+    # Node progress is logged at INFO; set TWINEWRITER_LOG=INFO to see it
+    level = os.getenv("TWINEWRITER_LOG", "WARNING").upper()
+    if not isinstance(logging.getLevelName(level), int):
+        # Unknown level names would make basicConfig raise ValueError
+        level = "WARNING"
+    logging.basicConfig(level=level, format="%(message)s")
+
     print("\n🚀 TwineWriter Interactive Mode")
     print("=" * 70)
 
@@ -7,26 +7,124 @@ variables and instantiates the appropriate langchain chat LLM adapter.
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import importlib
 import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, List
 
-_LLM_INSTANCE = None
+# Built LLM clients keyed by their configuration, so repeated get_llm() calls
+# reuse the same client (and its HTTP connection pool). Least recently used
+# clients are evicted, so UI-supplied keys from past sessions are not kept
+_LLM_CACHE: "OrderedDict[tuple, LLMWrapper]" = OrderedDict()
+_LLM_CACHE_MAXSIZE = 8
+_LLM_CACHE_LOCK = threading.Lock()
+
+# LLM settings read from the environment, snapshotted once per process
+_ENV_KEYS = (
+    "OPENAI_API_KEY",
+    "ANTHROPIC_API_KEY",
+    "USE_OLLAMA",
+    "OPENAI_MODEL",
+    "ANTHROPIC_MODEL",
+    "OLLAMA_MODEL",
+    "OLLAMA_BASE_URL",
+    "LLM_TEMPERATURE",
+)
+_ENV_SNAPSHOT: dict[str, str] = {}
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+# API key values that mean "not configured"
+_DISABLED_KEYS = frozenset({"", "false"})
+
+
+def refresh_env() -> None:
+    """Re-read the LLM environment variables (e.g. after load_dotenv or in tests).
+
+    Clients built from the previous values are dropped from the cache.
+    """
+    _ENV_SNAPSHOT.clear()
+    _ENV_SNAPSHOT.update({key: os.environ.get(key, "") for key in _ENV_KEYS})
+    _LLM_CACHE.clear()
+
+
+refresh_env()
+
+
+def _env_api_key(name: str) -> str:
+    """Return the API key stored in env var `name`, or "" if it is unset/disabled."""
+    key = _ENV_SNAPSHOT[name]
+    return "" if key.lower() in _DISABLED_KEYS else key
+
+
+def _env_temperature() -> float:
+    return float(_ENV_SNAPSHOT["LLM_TEMPERATURE"] or "0.7")
+
+
+# Provider name -> (module, class) of the langchain chat model adapter
+_PROVIDER_CLASSES = {
+    "openai": ("langchain_openai", "ChatOpenAI"),
+    "anthropic": ("langchain_anthropic", "ChatAnthropic"),
+    "ollama": ("langchain_ollama", "ChatOllama"),
+}
+_PROVIDER_CACHE: dict[str, type] = {}
+
+
+def _configure_llm_cache() -> bool:
+    """Enable LangChain's SQLite response cache when TWINEWRITER_CACHE_ENABLED=true.
+
+    Identical prompts (same topic, tone, base content, or revision feedback)
+    are then answered from the cache instead of calling the provider again.
+    Returns whether the cache was enabled.
+    """
+    if os.getenv("TWINEWRITER_CACHE_ENABLED", "").lower() != "true":
+        return False
+
+    from langchain_community.cache import SQLiteCache
+    from langchain_core.globals import set_llm_cache
+
+    set_llm_cache(
+        SQLiteCache(
+            database_path=os.getenv("TWINEWRITER_CACHE", ".twinewriter_cache.db")
+        )
+    )
+    return True
+
+
+# LangChain only consults the response cache on invoke()/batch(), so the
+# streaming methods below fall back to invoke() while it is enabled
+_RESPONSE_CACHE_ENABLED = _configure_llm_cache()
+
+
+def _cached_import(module_path: str, class_name: str) -> Any:
+    """Import `class_name` from `module_path`, reusing an already-loaded module."""
+    module = sys.modules.get(module_path) or importlib.import_module(module_path)
+    return getattr(module, class_name)
+
+
+def _chat_model_class(provider: str) -> type:
+    """Return the chat model class for `provider`, importing it on first use."""
+    cls = _PROVIDER_CACHE.get(provider)
+    if cls is None:
+        cls = _PROVIDER_CACHE[provider] = _cached_import(*_PROVIDER_CLASSES[provider])
+    return cls
 
 
 class LLMWrapper:
+    __slots__ = ("_llm", "invoke")
+
     def __init__(self, llm: Any):
         self._llm = llm
+        # `invoke(messages)` returns an object with a `content` attribute
+        # (string), as the nodes expect. Bind the model's own invoke() once when
+        # it exists (most adapters expose it) so calls go straight to it.
+        self.invoke = llm.invoke if hasattr(llm, "invoke") else self._invoke_fallback
 
-    def invoke(self, messages: List[Any]) -> Any:
-        """Invoke the underlying LLM using the most compatible method available.
-
-        Returns an object with a `content` attribute (string). This matches the
-        usage in the nodes which call `response.content`.
-        """
-        # If the model has an `invoke` method (some adapters expose it), use it
-        if hasattr(self._llm, "invoke"):
-            return self._llm.invoke(messages)
-
+    def _invoke_fallback(self, messages: List[Any]) -> Any:
+        """Invoke an LLM without `invoke()` using the most compatible method available."""
         # Try calling the model directly (some langchain chat models support __call__)
         try:
             out = self._llm(messages)
@@ -77,10 +175,12 @@ class LLMWrapper:
     def stream(self, messages: List[Any]):
         """Stream the underlying LLM response token by token.
         
-        Yields chunks of content as they are generated.
+        Yields chunks of content as they are generated. With the response
+        cache enabled the whole response is yielded at once, as it may come
+        from the cache.
         """
         # If the model has a `stream` method, use it
-        if hasattr(self._llm, "stream"):
+        if hasattr(self._llm, "stream") and not _RESPONSE_CACHE_ENABLED:
             for chunk in self._llm.stream(messages):
                 if hasattr(chunk, "content"):
                     yield chunk.content
@@ -91,6 +191,49 @@ class LLMWrapper:
             response = self.invoke(messages)
             yield response.content
 
+    async def ainvoke(self, messages: List[Any]) -> Any:
+        """Invoke the underlying LLM without blocking the event loop.
+
+        Falls back to running `invoke()` in a worker thread for models that
+        have no native async support.
+        """
+        if hasattr(self._llm, "ainvoke"):
+            return await self._llm.ainvoke(messages)
+        return await asyncio.to_thread(self.invoke, messages)
+
+    async def astream(self, messages: List[Any]):
+        """Asynchronously stream the underlying LLM response chunk by chunk.
+
+        Like `stream()`, yields the whole response at once when the response
+        cache is enabled.
+        """
+        if hasattr(self._llm, "astream") and not _RESPONSE_CACHE_ENABLED:
+            async for chunk in self._llm.astream(messages):
+                if hasattr(chunk, "content"):
+                    yield chunk.content
+                elif isinstance(chunk, str):
+                    yield chunk
+        else:
+            response = await self.ainvoke(messages)
+            yield response.content
+
+
+def generate_variants(llm: LLMWrapper, messages: List[Any], k: int = 3) -> List[str]:
+    """Generate `k` independent drafts for the same prompt concurrently.
+
+    Uses the model's native `batch()` capped at `k` concurrent requests, and
+    falls back to a thread pool over `invoke()` for models without it. With
+    the response cache enabled, a prompt that is already cached returns the
+    same draft `k` times.
+    """
+    prompts = [messages] * k
+    if hasattr(llm._llm, "batch"):
+        responses = llm._llm.batch(prompts, config={"max_concurrency": k})
+    else:
+        with ThreadPoolExecutor(max_workers=k) as pool:
+            responses = list(pool.map(llm.invoke, prompts))
+    return [response.content.strip() for response in responses]
+
 
 def _create_llm_from_config(
     llm_provider: str = "",
@@ -106,28 +249,32 @@ def _create_llm_from_config(
       2. anthropic_api_key -> langchain_anthropic.ChatAnthropic
       3. llm_provider == "Ollama" -> langchain_ollama.ChatOllama
     """
-    temp = float(os.getenv("LLM_TEMPERATURE", "0.7"))
+    temp = _env_temperature()
     
     try:
         # OpenAI
         if openai_api_key:
-            from langchain_openai import ChatOpenAI
+            ChatOpenAI = _chat_model_class("openai")
 
-            model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-            llm = ChatOpenAI(model=model, temperature=temp, api_key=openai_api_key)
+            model = _ENV_SNAPSHOT["OPENAI_MODEL"] or "gpt-4o-mini"
+            llm = ChatOpenAI(
+                model=model, temperature=temp, api_key=openai_api_key, streaming=True
+            )
             return LLMWrapper(llm)
 
         # Anthropic
         if anthropic_api_key:
-            from langchain_anthropic import ChatAnthropic
+            ChatAnthropic = _chat_model_class("anthropic")
 
-            model = os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-20241022")
-            llm = ChatAnthropic(model=model, temperature=temp, api_key=anthropic_api_key)
+            model = _ENV_SNAPSHOT["ANTHROPIC_MODEL"] or "claude-3-5-sonnet-20241022"
+            llm = ChatAnthropic(
+                model=model, temperature=temp, api_key=anthropic_api_key, streaming=True
+            )
             return LLMWrapper(llm)
 
         # Ollama (local)
         if llm_provider == "Ollama" and ollama_model:
-            from langchain_ollama import ChatOllama
+            ChatOllama = _chat_model_class("ollama")
 
             llm = ChatOllama(model=ollama_model, base_url=ollama_base_url, temperature=temp)
             return LLMWrapper(llm)
@@ -141,6 +288,20 @@ def _create_llm_from_config(
     )
 
 
+def env_provider() -> str | None:
+    """Return the provider selected by the environment, or None if none is set.
+
+    Follows the same priority as _create_llm_from_env.
+    """
+    if _env_api_key("OPENAI_API_KEY"):
+        return "openai"
+    if _env_api_key("ANTHROPIC_API_KEY"):
+        return "anthropic"
+    if _ENV_SNAPSHOT["USE_OLLAMA"].lower() in _TRUTHY:
+        return "ollama"
+    return None
+
+
 def _create_llm_from_env() -> LLMWrapper:
     """Instantiate a langchain chat LLM based on environment variables.
 
@@ -151,32 +312,36 @@ def _create_llm_from_env() -> LLMWrapper:
     """
     # OpenAI
     try:
-        openai_key = os.getenv("OPENAI_API_KEY", "")
-        if openai_key and openai_key.lower() != "false":
-            from langchain_openai import ChatOpenAI
-
-            model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-            temp = float(os.getenv("LLM_TEMPERATURE", "0.7"))
-            llm = ChatOpenAI(model=model, temperature=temp, api_key=openai_key)
+        openai_key = _env_api_key("OPENAI_API_KEY")
+        if openai_key:
+            ChatOpenAI = _chat_model_class("openai")
+
+            model = _ENV_SNAPSHOT["OPENAI_MODEL"] or "gpt-4o-mini"
+            temp = _env_temperature()
+            llm = ChatOpenAI(
+                model=model, temperature=temp, api_key=openai_key, streaming=True
+            )
             return LLMWrapper(llm)
 
         # Anthropic
-        anthropic_key = os.getenv("ANTHROPIC_API_KEY", "")
-        if anthropic_key and anthropic_key.lower() != "false":
-            from langchain_anthropic import ChatAnthropic
-
-            model = os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-20241022")
-            temp = float(os.getenv("LLM_TEMPERATURE", "0.7"))
-            llm = ChatAnthropic(model=model, temperature=temp, api_key=anthropic_key)
+        anthropic_key = _env_api_key("ANTHROPIC_API_KEY")
+        if anthropic_key:
+            ChatAnthropic = _chat_model_class("anthropic")
+
+            model = _ENV_SNAPSHOT["ANTHROPIC_MODEL"] or "claude-3-5-sonnet-20241022"
+            temp = _env_temperature()
+            llm = ChatAnthropic(
+                model=model, temperature=temp, api_key=anthropic_key, streaming=True
+            )
             return LLMWrapper(llm)
 
         # Ollama (local)
-        if os.getenv("USE_OLLAMA", "").lower() == "true":
-            from langchain_ollama import ChatOllama
+        if _ENV_SNAPSHOT["USE_OLLAMA"].lower() in _TRUTHY:
+            ChatOllama = _chat_model_class("ollama")
 
-            model_name = os.getenv("OLLAMA_MODEL", "llama3.2")
-            base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-            temp = float(os.getenv("LLM_TEMPERATURE", "0.7"))
+            model_name = _ENV_SNAPSHOT["OLLAMA_MODEL"] or "llama3.2"
+            base_url = _ENV_SNAPSHOT["OLLAMA_BASE_URL"] or "http://localhost:11434"
+            temp = _env_temperature()
             llm = ChatOllama(model=model_name, base_url=base_url, temperature=temp)
             return LLMWrapper(llm)
 
@@ -189,24 +354,55 @@ def _create_llm_from_env() -> LLMWrapper:
     )
 
 
+def _key_digest(api_key: str) -> str:
+    """Fingerprint an API key so cache keys never hold the raw secret."""
+    if not api_key:
+        return ""
+    return hashlib.blake2b(api_key.encode(), digest_size=8).hexdigest()
+
+
+def _cached_llm(key: tuple, create) -> LLMWrapper:
+    """Return the client cached under `key`, building it with `create()` on a miss."""
+    with _LLM_CACHE_LOCK:
+        llm = _LLM_CACHE.get(key)
+        if llm is not None:
+            _LLM_CACHE.move_to_end(key)
+            return llm
+    llm = create()
+    with _LLM_CACHE_LOCK:
+        _LLM_CACHE[key] = llm
+        if len(_LLM_CACHE) > _LLM_CACHE_MAXSIZE:
+            _LLM_CACHE.popitem(last=False)
+    return llm
+
+
 def get_llm(state: dict = None) -> LLMWrapper:
     """Get LLM instance from state configuration or environment variables.
     
     If state is provided with LLM configuration, use that.
-    Otherwise, fall back to environment variables with caching.
+    Otherwise, fall back to environment variables. Either way the client is
+    cached per configuration.
     """
-    # If state has LLM configuration, create from state (no caching)
+    # If state has LLM configuration, create from state
     if state and state.get("llm_provider"):
-        return _create_llm_from_config(
+        config = dict(
             llm_provider=state.get("llm_provider", ""),
             openai_api_key=state.get("openai_api_key", ""),
             anthropic_api_key=state.get("anthropic_api_key", ""),
             ollama_model=state.get("ollama_model", "llama3.2"),
             ollama_base_url=state.get("ollama_base_url", "http://localhost:11434")
         )
+        key = (
+            config["llm_provider"],
+            _key_digest(config["openai_api_key"]),
+            _key_digest(config["anthropic_api_key"]),
+            config["ollama_model"],
+            config["ollama_base_url"],
+            _ENV_SNAPSHOT["OPENAI_MODEL"],
+            _ENV_SNAPSHOT["ANTHROPIC_MODEL"],
+            _ENV_SNAPSHOT["LLM_TEMPERATURE"],
+        )
+        return _cached_llm(key, lambda: _create_llm_from_config(**config))
     
     # Fall back to cached environment-based LLM
-    global _LLM_INSTANCE
-    if _LLM_INSTANCE is None:
-        _LLM_INSTANCE = _create_llm_from_env()
-    return _LLM_INSTANCE
+    return _cached_llm(("env",), _create_llm_from_env)
@@ -1,15 +1,14 @@
 """Data models for TwineWriter"""
 
-from typing import TypedDict, List
-from pydantic import BaseModel, Field
+from typing import NamedTuple, TypedDict, List
 
 
-class TweetItem(BaseModel):
-    """Single tweet in a thread"""
+class TweetItem(NamedTuple):
+    """Single tweet in a thread, as an (index, content, char_count) tuple"""
 
-    index: int = Field(description="Position in thread (1-based)")
-    content: str = Field(description="Tweet content")
-    char_count: int = Field(description="Character count")
+    index: int  # Position in thread (1-based)
+    content: str  # Tweet content
+    char_count: int  # Character count
 
     def __str__(self):
         return f"[{self.index}] {self.content} ({self.char_count} chars)"
@@ -32,6 +31,8 @@ class AgentState(TypedDict):
     ollama_base_url: str
 
     # Generated content
+    num_variants: int  # Drafts to generate concurrently (default 1)
+    variants: List[str]
     raw_content: str
     tweets: List[TweetItem]
 
@@ -1,7 +1,12 @@
 """Node implementations for the TwineWriter workflow."""
 
+import asyncio
+import logging
 import os
+import queue
 import re
+import sys
+import threading
 from datetime import datetime
 from typing import List
 
@@ -9,10 +14,74 @@ from langchain_core.messages import SystemMessage, HumanMessage
 
 from .models import TweetItem, AgentState
 
+logger = logging.getLogger("twinewriter")
+
+# Sentence boundary: whitespace following terminal punctuation
+_SENT_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+
+# Static instructions go in the system message so every request shares the
+# same prompt prefix; per-request details travel in the human message
+_GENERATION_SYSTEM = SystemMessage(
+    content=(
+        "You are TwineWriter, an expert Twitter content creator. Write engaging, "
+        "conversational content in the requested tone: open with a hook, use "
+        "relevant emojis where they fit, and make it shareable. Write one "
+        "cohesive piece of any length; it is split into a thread later."
+    )
+)
+
+_REVISION_SYSTEM = SystemMessage(
+    content=(
+        "You are TwineWriter. Revise the given Twitter content according to the "
+        "user's feedback, keeping its tone, topic and engaging, shareable style. "
+        "Return the revised content as one cohesive piece."
+    )
+)
+
+
+def build_generation_messages(topic: str, tone: str, base_content: str = "") -> list:
+    """Build the chat messages for drafting content about `topic`."""
+    prompt = f"Tone: {tone}\nTopic: {topic}"
+    if base_content:
+        prompt += f"\nBase content to expand on: {base_content}"
+    return [_GENERATION_SYSTEM, HumanMessage(content=prompt)]
+
+
+def _drain_to_stdout(chunks: "queue.Queue[str | None]") -> None:
+    """Write queued chunks to stdout until the None sentinel arrives."""
+    for chunk in iter(chunks.get, None):
+        sys.stdout.write(chunk)
+        sys.stdout.flush()
+    sys.stdout.write("\n")
+
+
+async def _stream_to_stdout(llm, messages) -> str:
+    """Echo streamed LLM chunks to stdout and return the stripped full text.
+
+    Chunks pass through a bounded queue drained by a writer thread, so a slow
+    terminal applies backpressure without blocking the stream on every write.
+    """
+    buf: List[str] = []
+    chunks: "queue.Queue[str | None]" = queue.Queue(maxsize=64)
+    writer = threading.Thread(target=_drain_to_stdout, args=(chunks,), daemon=True)
+    writer.start()
+    try:
+        async for chunk in llm.astream(messages):
+            buf.append(chunk)
+            try:
+                chunks.put_nowait(chunk)
+            except queue.Full:
+                await asyncio.to_thread(chunks.put, chunk)
+    finally:
+        await asyncio.to_thread(chunks.put, None)
+        await asyncio.to_thread(writer.join)
+    return "".join(buf).strip()
+
 
 def input_node(state: AgentState) -> AgentState:
     """Receives and validates user input"""
-    print("📥 INPUT NODE: Processing user request...")
+    logger.info("📥 INPUT NODE: Processing user request...")
 
     if not state.get("max_tweet_length"):
         state["max_tweet_length"] = 280
@@ -24,65 +93,51 @@ def input_node(state: AgentState) -> AgentState:
     state["approved"] = False
     state["error"] = ""
 
-    print(f"   Topic: {state['topic']}")
-    print(f"   Tone: {state['tone']}")
-    print(f"   Max length: {state['max_tweet_length']} chars")
+    logger.info("   Topic: %s", state["topic"])
+    logger.info("   Tone: %s", state["tone"])
+    logger.info("   Max length: %s chars", state["max_tweet_length"])
 
     return state
 
 
-def content_generation_node(state: AgentState) -> AgentState:
+async def content_generation_node(state: AgentState) -> AgentState:
     """Generate tweet content using LLM"""
-    print("\n✍️  CONTENT GENERATION NODE: Drafting content...")
+    logger.info("✍️  CONTENT GENERATION NODE: Drafting content...")
 
     # If content already generated (from streaming), skip this node
     if state.get("raw_content"):
-        print("   Content already generated, skipping...")
+        logger.info("   Content already generated, skipping...")
         return state
 
     # Use centralized LLM client with state configuration
     try:
-        from .llm import get_llm
+        from .llm import generate_variants, get_llm
 
         llm = get_llm(state)
-        print("   Using configured LLM client")
+        logger.info("   Using configured LLM client")
     except Exception as e:
         state["error"] = f"LLM initialization failed: {str(e)}"
         return state
 
-    # Build prompt
-    system_prompt = f"""You are TwineWriter, an expert Twitter content creator.
-
-Your task: Create engaging Twitter content based on the user's topic and desired tone.
-
-GUIDELINES:
-- Tone: {state['tone']}
-- Write naturally and conversationally
-- Use hooks that grab attention
-- Include relevant emojis when appropriate
-- Make it shareable and engaging
-- If the content is complex, write it as a cohesive piece (we'll split it later if needed)
-
-Topic: {state['topic']}
-
-{f"Base content to expand on: {state['base_content']}" if state.get('base_content') else ""}
-
-Generate the tweet content now. Write it as a single cohesive piece - don't worry about length."""
-
     try:
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(
-                content=f"Create engaging Twitter content about: {state['topic']}"
-            ),
-        ]
+        messages = build_generation_messages(
+            state["topic"], state["tone"], state.get("base_content", "")
+        )
 
-        # Non-streaming mode (streaming is handled in app.py)
-        response = llm.invoke(messages)
-        state["raw_content"] = response.content.strip()
+        num_variants = state.get("num_variants", 1)
+        if num_variants > 1:
+            # Draft alternatives concurrently; the first one seeds the workflow
+            state["variants"] = await asyncio.to_thread(
+                generate_variants, llm, messages, num_variants
+            )
+            state["raw_content"] = state["variants"][0]
+            logger.info("   Generated %d variants", num_variants)
+        else:
+            # Stream tokens to the terminal as they arrive
+            state["raw_content"] = await _stream_to_stdout(llm, messages)
 
-        print(f"   Generated {len(state['raw_content'])} characters")
-        print(f"   Preview: {state['raw_content'][:100]}...")
+        logger.info("   Generated %d characters", len(state["raw_content"]))
+        logger.info("   Preview: %s...", state["raw_content"][:100])
 
     except Exception as e:
         state["error"] = f"Content generation failed: {str(e)}"
@@ -92,22 +147,23 @@ Generate the tweet content now. Write it as a single cohesive piece - don't worr
 
 def length_checker_node(state: AgentState) -> AgentState:
     """Check if content fits in a single tweet"""
-    print("\n📏 LENGTH CHECKER NODE: Analyzing content length...")
+    logger.info("📏 LENGTH CHECKER NODE: Analyzing content length...")
 
     max_length = state["max_tweet_length"]
-    content_length = len(state["raw_content"]) if state.get("raw_content") else 0
+    raw_content = state.get("raw_content", "")
+    content_length = len(raw_content)
 
-    print(f"   Content length: {content_length} chars")
-    print(f"   Max tweet length: {max_length} chars")
+    logger.info("   Content length: %d chars", content_length)
+    logger.info("   Max tweet length: %d chars", max_length)
 
     if content_length <= max_length:
         # Single tweet
         state["tweets"] = [
-            TweetItem(index=1, content=state["raw_content"], char_count=content_length)
+            TweetItem(index=1, content=raw_content, char_count=content_length)
         ]
-        print("   ✅ Fits in single tweet!")
+        logger.info("   ✅ Fits in single tweet!")
     else:
-        print("   ⚠️  Exceeds limit - will need thread splitting")
+        logger.info("   ⚠️  Exceeds limit - will need thread splitting")
         state["tweets"] = []
 
     return state
@@ -115,10 +171,10 @@ def length_checker_node(state: AgentState) -> AgentState:
 
 def thread_splitter_node(state: AgentState) -> AgentState:
     """Split long content into logical thread"""
-    print("\n✂️  THREAD SPLITTER NODE: Creating thread structure...")
+    logger.info("✂️  THREAD SPLITTER NODE: Creating thread structure...")
 
     if state.get("tweets"):
-        print("   Content already fits in single tweet, skipping.")
+        logger.info("   Content already fits in single tweet, skipping.")
         return state
 
     content = state.get("raw_content", "")
@@ -129,57 +185,57 @@ def thread_splitter_node(state: AgentState) -> AgentState:
     effective_max = max_length - reserve_chars
 
     # Split by sentences or logical breaks
-    sentences = re.split(r"(?<=[.!?])\s+", content)
+    sentences = _SENT_SPLIT.split(content)
 
     tweets: List[str] = []
-    current_tweet = ""
+    # Pending tokens for the current tweet; buf_len counts each token plus
+    # its trailing separator, so joining only happens when a tweet is emitted
+    buf: List[str] = []
+    buf_len = 0
 
-    for sentence in sentences:
+    for sentence, sentence_len in zip(sentences, map(len, sentences)):
         # If single sentence is too long, split by words
-        if len(sentence) > effective_max:
-            words = sentence.split()
-            for word in words:
-                if len(current_tweet) + len(word) + 1 <= effective_max:
-                    current_tweet += word + " "
-                else:
-                    if current_tweet:
-                        tweets.append(current_tweet.strip())
-                    current_tweet = word + " "
+        if sentence_len > effective_max:
+            tokens = [(word, len(word)) for word in sentence.split()]
         else:
-            # Try to add sentence to current tweet
-            if len(current_tweet) + len(sentence) + 1 <= effective_max:
-                current_tweet += sentence + " "
+            tokens = ((sentence, sentence_len),)
+
+        for token, token_len in tokens:
+            # Try to add token to current tweet
+            if buf_len + token_len + 1 <= effective_max:
+                buf.append(token)
+                buf_len += token_len + 1
             else:
                 # Save current tweet and start new one
-                if current_tweet:
-                    tweets.append(current_tweet.strip())
-                current_tweet = sentence + " "
+                if buf:
+                    tweets.append(" ".join(buf).strip())
+                buf = [token]
+                buf_len = token_len + 1
 
     # Add remaining content
-    if current_tweet.strip():
-        tweets.append(current_tweet.strip())
+    remaining = " ".join(buf).strip()
+    if remaining:
+        tweets.append(remaining)
 
     # Create TweetItems with numbering
     total_tweets = len(tweets)
-    state["tweets"] = [
-        TweetItem(
-            index=i + 1,
-            content=f"{i+1}/{total_tweets} {tweet}",
-            char_count=len(f"{i+1}/{total_tweets} {tweet}"),
-        )
-        for i, tweet in enumerate(tweets)
-    ]
+    numbered: List[TweetItem] = []
+    for i, tweet in enumerate(tweets, 1):
+        content = f"{i}/{total_tweets} {tweet}"
+        numbered.append(TweetItem(index=i, content=content, char_count=len(content)))
+    state["tweets"] = numbered
 
-    print(f"   ✅ Split into {total_tweets} tweets")
-    for tweet in state["tweets"]:
-        print(f"      {tweet}")
+    logger.info("   ✅ Split into %d tweets", total_tweets)
+    if logger.isEnabledFor(logging.INFO):
+        for tweet in state["tweets"]:
+            logger.info("      %s", tweet)
 
     return state
 
 
 def human_review_node(state: AgentState) -> AgentState:
     """Human-in-the-loop review and approval"""
-    print("\n👤 HUMAN REVIEW NODE: Awaiting human feedback...")
+    logger.info("👤 HUMAN REVIEW NODE: Awaiting human feedback...")
     print("\n" + "=" * 70)
     print("GENERATED CONTENT:")
     print("=" * 70)
@@ -252,49 +308,44 @@ def human_review_node(state: AgentState) -> AgentState:
     return state
 
 
-def revision_node(state: AgentState) -> AgentState:
+async def revision_node(state: AgentState) -> AgentState:
     """Revise content based on human feedback"""
-    print("\n🔄 REVISION NODE: Revising content based on feedback...")
+    logger.info("🔄 REVISION NODE: Revising content based on feedback...")
 
     try:
         from .llm import get_llm
 
-        llm = get_llm()
+        llm = get_llm(state)
     except Exception as e:
         state["error"] = f"LLM initialization failed: {str(e)}"
         return state
 
-    current_content = "\n\n".join([t.content for t in state.get("tweets", [])])
-
-    system_prompt = f"""You are TwineWriter. The user has reviewed your content and wants revisions.
-
-ORIGINAL CONTENT:
-{current_content}
-
-USER FEEDBACK:
-{state.get('human_feedback','')}
-
-Please revise the content according to the feedback while maintaining:
-- Tone: {state.get('tone')}
-- Topic: {state.get('topic')}
-- Engaging and shareable style
-
-Generate the REVISED content as a single cohesive piece."""
+    tweets = state.get("tweets") or ()
+    if len(tweets) == 1:
+        current_content = tweets[0].content
+    else:
+        current_content = "\n\n".join(t.content for t in tweets)
 
     try:
         messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content="Revise the content based on the feedback."),
+            _REVISION_SYSTEM,
+            HumanMessage(
+                content=(
+                    f"Tone: {state.get('tone')}\n"
+                    f"Topic: {state.get('topic')}\n\n"
+                    f"ORIGINAL CONTENT:\n{current_content}\n\n"
+                    f"USER FEEDBACK:\n{state.get('human_feedback', '')}"
+                )
+            ),
         ]
 
-        response = llm.invoke(messages)
-        state["raw_content"] = response.content.strip()
+        state["raw_content"] = await _stream_to_stdout(llm, messages)
 
         # Reset tweets to force re-processing
         state["tweets"] = []
         state["needs_revision"] = False
 
-        print(f"   ✅ Content revised ({len(state['raw_content'])} chars)")
+        logger.info("   ✅ Content revised (%d chars)", len(state["raw_content"]))
 
     except Exception as e:
         state["error"] = f"Revision failed: {str(e)}"
@@ -304,7 +355,7 @@ Generate the REVISED content as a single cohesive piece."""
 
 def finalizer_node(state: AgentState) -> AgentState:
     """Create final JSON output"""
-    print("\n🎯 FINALIZER NODE: Preparing final output...")
+    logger.info("🎯 FINALIZER NODE: Preparing final output...")
 
     state["final_json"] = {
         "status": "approved",
@@ -312,18 +363,14 @@ def finalizer_node(state: AgentState) -> AgentState:
         "topic": state.get("topic"),
         "tone": state.get("tone"),
         "thread": [
-            {
-                "index": tweet.index,
-                "content": tweet.content,
-                "char_count": tweet.char_count,
-            }
-            for tweet in state.get("tweets", [])
+            {"index": index, "content": content, "char_count": char_count}
+            for index, content, char_count in state.get("tweets", [])
         ],
         "total_tweets": len(state.get("tweets", [])),
         "is_thread": len(state.get("tweets", [])) > 1,
     }
 
-    print("   ✅ Final JSON ready!")
-    print(f"   Total tweets: {len(state.get('tweets', []))}")
+    logger.info("   ✅ Final JSON ready!")
+    logger.info("   Total tweets: %d", len(state.get("tweets", [])))
 
     return state
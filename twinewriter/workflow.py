@@ -1,5 +1,7 @@
 """Workflow construction and run utilities for TwineWriter."""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Literal
 
 from langgraph.graph import StateGraph, END
@@ -35,8 +37,11 @@ def should_revise(state: AgentState) -> str:
     return "review"  # Loop back for another review
 
 
-def create_graph():
-    """Build the LangGraph workflow"""
+def create_graph(checkpoint: bool = True):
+    """Build the LangGraph workflow
+
+    With `checkpoint=False` the graph is compiled without a MemorySaver.
+    """
 
     workflow = StateGraph(AgentState)
 
@@ -61,14 +66,53 @@ def create_graph():
     workflow.add_edge("revise", "check_length")
     workflow.add_edge("finalize", END)
 
+    if not checkpoint:
+        return workflow.compile()
+
     # Add memory for checkpointing
     memory = MemorySaver()
 
     return workflow.compile(checkpointer=memory)
 
 
-def run_twinewriter(topic: str, tone: str = "professional", base_content: str = ""):
-    """Run the TwineWriter agent and return final JSON if approved."""
+_GRAPH = None
+
+
+def _get_graph():
+    """Return the compiled workflow, building it on first use.
+
+    The graph is shared by every run in the process and nothing resumes a
+    run, so it has no checkpointer to accumulate each run's state.
+    """
+    global _GRAPH
+    if _GRAPH is None:
+        _GRAPH = create_graph(checkpoint=False)
+    return _GRAPH
+
+
+def iter_graph_stream(graph, graph_input, config=None):
+    """Iterate `graph.astream()` from synchronous code.
+
+    Events are yielded as they arrive, so sync callers (such as the Streamlit
+    app) can keep updating their UI while the async nodes run.
+    """
+    loop = asyncio.new_event_loop()
+    events = graph.astream(graph_input, config)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(events.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(events.aclose())
+        loop.close()
+
+
+async def arun_twinewriter(
+    topic: str, tone: str = "professional", base_content: str = ""
+):
+    """Run the TwineWriter agent asynchronously and return final JSON if approved."""
 
     # Create initial state
     initial_state = {
@@ -76,30 +120,35 @@ def run_twinewriter(topic: str, tone: str = "professional", base_content: str =
         "tone": tone,
         "base_content": base_content,
         "max_tweet_length": 280,
-        "raw_content": "",
-        "tweets": [],
-        "human_feedback": "",
-        "needs_revision": False,
-        "approved": False,
-        "final_json": {},
-        "error": "",
+        # Remaining AgentState fields are filled in by the nodes
     }
 
-    # Create and run graph
-    graph = create_graph()
-
-    config = {"configurable": {"thread_id": "twinewriter-session"}}
+    # Reuse the compiled graph
+    graph = _get_graph()
 
     final_state = None
-    for state in graph.stream(initial_state, config):
+    async for state in graph.astream(initial_state):
         final_state = state
 
     # Extract final state from the last node
     if final_state:
-        last_node = list(final_state.keys())[-1]
+        last_node = next(reversed(final_state))
         final_state = final_state[last_node]
 
     if final_state and final_state.get("approved") and not final_state.get("error"):
         return final_state["final_json"]
     else:
         return None
+
+
+def run_twinewriter(topic: str, tone: str = "professional", base_content: str = ""):
+    """Run the TwineWriter agent and return final JSON if approved."""
+    run = arun_twinewriter(topic, tone, base_content)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run)
+    # asyncio.run() refuses to nest inside a running loop (Jupyter, async
+    # handlers), so give the run its own loop on a worker thread
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, run).result()